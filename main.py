@@ -1,11 +1,33 @@
 #!/usr/bin/env python3
 import os
 import sys
+import signal
 import argparse
 from http.server import ThreadingHTTPServer
-from server import UploadEnabledHTTPHandler
+from server import UploadEnabledHTTPHandler, AccessLogger
 
-def parse_arguments():
+def positive_int(value):
+    """Argparse type for integers greater than zero."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
+
+def non_negative_int(value):
+    """Argparse type for integers greater than or equal to zero."""
+    number = int(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"must not be negative, got {value}")
+    return number
+
+def sample_rate(value):
+    """Argparse type for a sampling fraction between 0.0 and 1.0."""
+    rate = float(value)
+    if not 0.0 <= rate <= 1.0:
+        raise argparse.ArgumentTypeError(f"must be between 0.0 and 1.0, got {value}")
+    return rate
+
+def parse_arguments(argv=None):
     """Parse command line arguments."""
     parser = argparse.ArgumentParser(
         description='Simple HTTP Server with file upload/download capability'
@@ -22,15 +44,87 @@ def parse_arguments():
         default='0.0.0.0',
         help='Host address to bind to (default: 0.0.0.0)'
     )
+    parser.add_argument(
+        '--access-log',
+        type=str,
+        default='-',
+        help="Access log file, or '-' for stderr (default: -)"
+    )
+    parser.add_argument(
+        '--access-log-format',
+        choices=['common', 'json'],
+        default='common',
+        help='Access log format (default: common)'
+    )
+    rotation = parser.add_mutually_exclusive_group()
+    rotation.add_argument(
+        '--access-log-max-bytes',
+        type=non_negative_int,
+        default=0,
+        help='Rotate the access log file when it reaches this size (default: 0, disabled)'
+    )
+    rotation.add_argument(
+        '--access-log-rotate-interval',
+        type=non_negative_int,
+        default=0,
+        help='Rotate the access log file every N seconds (default: 0, disabled)'
+    )
+    parser.add_argument(
+        '--access-log-backups',
+        type=positive_int,
+        help='Number of rotated access log files to keep (default: 5)'
+    )
+    parser.add_argument(
+        '--access-log-sample',
+        type=sample_rate,
+        default=1.0,
+        help='Fraction of successful requests to log; errors are always logged (default: 1.0)'
+    )
+    parser.add_argument(
+        '--access-log-queue-size',
+        type=positive_int,
+        default=10000,
+        help='Maximum pending access log entries before new ones are dropped (default: 10000)'
+    )
     parser.add_argument(
         'directory', 
         nargs='?', 
         default=os.getcwd(),
         help='Base directory (server will only serve ./data/ subdirectory)'
     )
-    return parser.parse_args()
+    args = parser.parse_args(argv)
+    
+    # Rotation only applies to log files
+    rotation_options = {
+        '--access-log-max-bytes': args.access_log_max_bytes,
+        '--access-log-rotate-interval': args.access_log_rotate_interval,
+        '--access-log-backups': args.access_log_backups,
+    }
+    if args.access_log == '-':
+        for option, value in rotation_options.items():
+            if value:
+                parser.error(f"{option} requires --access-log to be a file")
+    if args.access_log_backups is None:
+        args.access_log_backups = 5
+    return args
 
-def run_server(host, port, directory):
+def create_access_logger(args):
+    """Create the asynchronous access logger from command line arguments."""
+    return AccessLogger(
+        path=args.access_log,
+        log_format=args.access_log_format,
+        max_bytes=args.access_log_max_bytes,
+        rotate_interval=args.access_log_rotate_interval,
+        backup_count=args.access_log_backups,
+        sample_rate=args.access_log_sample,
+        queue_size=args.access_log_queue_size,
+    )
+
+def handle_sigterm(signum, frame):
+    """Treat SIGTERM (e.g. from docker stop) like Ctrl+C so shutdown flushes the access log."""
+    raise KeyboardInterrupt
+
+def run_server(host, port, directory, access_logger=None):
     """Run the HTTP server."""
     # Change to the specified directory
     os.chdir(directory)
@@ -44,6 +138,7 @@ def run_server(host, port, directory):
     
     # Create the server
     handler = UploadEnabledHTTPHandler
+    handler.access_logger = access_logger
     server = ThreadingHTTPServer((host, port), handler)
     server.daemon_threads = True  # Set daemon threads
     
@@ -54,19 +149,29 @@ def run_server(host, port, directory):
     print(f"Accessible directory: {os.path.abspath(data_dir)}")
     print("Press Ctrl+C to stop the server")
     
+    signal.signal(signal.SIGTERM, handle_sigterm)
     try:
         server.serve_forever()
     except KeyboardInterrupt:
         print("\nShutting down server...")
         server.shutdown()
         server.server_close()
+        if access_logger is not None:
+            access_logger.close()
         print("Server stopped.")
     except Exception as e:
         print(f"\nError: {e}")
         server.shutdown()
         server.server_close()
+        if access_logger is not None:
+            access_logger.close()
         sys.exit(1)
 
 if __name__ == "__main__":
     args = parse_arguments()
-    run_server(args.host, args.port, args.directory) 
\ No newline at end of file
+    try:
+        access_logger = create_access_logger(args)
+    except OSError as e:
+        print(f"Error: cannot open access log: {e}")
+        sys.exit(1)
+    run_server(args.host, args.port, args.directory, access_logger) 
\ No newline at end of file
@@ -1,3 +1,4 @@
 from server.handler import UploadEnabledHTTPHandler
+from server.access_log import AccessLogger
 
-__all__ = ['UploadEnabledHTTPHandler'] 
\ No newline at end of file
+__all__ = ['UploadEnabledHTTPHandler', 'AccessLogger']
\ No newline at end of file
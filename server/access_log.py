@@ -0,0 +1,216 @@
+import sys
+import json
+import queue
+import random
+import logging
+import threading
+import logging.handlers
+from datetime import datetime
+
+# Sentinel placed on the queue to stop the writer thread
+_STOP = object()
+
+class AccessLogger:
+    """
+    Buffered access log written by a background thread.
+
+    Request handlers only build a small tuple and put it on a bounded queue;
+    formatting and I/O happen on the writer thread. When the queue is full the
+    entry is dropped and counted instead of blocking the request.
+    """
+
+    def __init__(self, path='-', log_format='common', max_bytes=0,
+                 rotate_interval=0, backup_count=5, sample_rate=1.0,
+                 queue_size=10000, batch_size=256):
+        """
+        Create the logger and start its writer thread.
+
+        Args:
+            path (str): Log file path, or '-' for stderr
+            log_format (str): 'common' (Common Log Format) or 'json'
+            max_bytes (int): Rotate the file once it reaches this size (0 disables)
+            rotate_interval (int): Rotate the file every N seconds (0 disables);
+                cannot be combined with max_bytes
+            backup_count (int): Number of rotated files to keep; must be at
+                least 1 when rotation is enabled
+            sample_rate (float): Fraction of successful requests to log;
+                responses with status >= 400 are always logged
+            queue_size (int): Maximum number of pending entries
+            batch_size (int): Maximum number of entries written per flush
+        """
+        if log_format not in ('common', 'json'):
+            raise ValueError(f"Unknown access log format: {log_format}")
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError("Sample rate must be between 0.0 and 1.0")
+        if queue_size < 1:
+            raise ValueError("Queue size must be at least 1")
+        if batch_size < 1:
+            raise ValueError("Batch size must be at least 1")
+        if max_bytes < 0 or rotate_interval < 0 or backup_count < 0:
+            raise ValueError("Rotation options must not be negative")
+        if max_bytes and rotate_interval:
+            raise ValueError("Size-based and time-based rotation cannot be combined")
+        if (max_bytes or rotate_interval) and backup_count < 1:
+            raise ValueError("Backup count must be at least 1 when rotation is enabled")
+
+        self.log_format = log_format
+        self.sample_rate = sample_rate
+        self.batch_size = batch_size
+        self.dropped = 0
+        self._reported_dropped = 0
+        self._lock = threading.Lock()
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._sink = self._create_sink(path, max_bytes, rotate_interval, backup_count)
+
+        self._thread = threading.Thread(target=self._run, name='access-log', daemon=True)
+        self._thread.start()
+
+    @staticmethod
+    def _create_sink(path, max_bytes, rotate_interval, backup_count):
+        """Create the logging handler that performs the actual writes and rotation."""
+        if path == '-':
+            sink = logging.StreamHandler(sys.stderr)
+        elif max_bytes:
+            sink = logging.handlers.RotatingFileHandler(
+                path, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8'
+            )
+        elif rotate_interval:
+            sink = logging.handlers.TimedRotatingFileHandler(
+                path, when='S', interval=rotate_interval,
+                backupCount=backup_count, encoding='utf-8'
+            )
+        else:
+            sink = logging.FileHandler(path, encoding='utf-8')
+        sink.setFormatter(logging.Formatter('%(message)s'))
+        return sink
+
+    def log_request(self, client, request_line, method, path, protocol, status, size, duration):
+        """
+        Queue an access log entry for a completed request.
+
+        Args:
+            client (str): Client address
+            request_line (str): Request line as received from the client
+            method (str): HTTP method, or None if the request line was invalid
+            path (str): Request path including the query string, or None
+            protocol (str): Request protocol version, e.g. 'HTTP/1.1', or None
+            status (int): Response status code
+            size (int): Response body size in bytes (0 for HEAD requests)
+            duration (float): Time spent handling the request, in seconds
+        """
+        if self.sample_rate < 1.0 and status < 400 and random.random() >= self.sample_rate:
+            return
+        self._put(('request', datetime.now().astimezone(), client, request_line,
+                   method or None, path or None, protocol or None, status, size, duration))
+
+    def log_message(self, client, message):
+        """Queue a free-form message such as an error logged by the handler."""
+        self._put(('message', datetime.now().astimezone(), client, message))
+
+    def _put(self, entry):
+        """Add an entry to the queue, counting it as dropped if the queue is full."""
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+
+    def _format(self, entry):
+        """Format a queued entry as a single log line."""
+        kind, timestamp, client = entry[:3]
+        if kind == 'message':
+            return self._format_message(timestamp, client, entry[3])
+
+        request_line, method, path, protocol, status, size, duration = entry[3:]
+        if self.log_format == 'json':
+            return json.dumps({
+                'time': timestamp.isoformat(),
+                'remote': client,
+                'method': method,
+                'route': path.split('?', 1)[0] if path else None,
+                'protocol': protocol,
+                'status': status,
+                'bytes': size,
+                'duration_ms': round(duration * 1000, 3),
+            })
+        return (
+            f"{client} - - [{timestamp.strftime('%d/%b/%Y:%H:%M:%S %z')}] "
+            f"\"{request_line or '-'}\" {status} {size or '-'}"
+        )
+
+    def _format_message(self, timestamp, client, message):
+        """Format a free-form message; client is None for the logger's own notices."""
+        if self.log_format == 'json':
+            return json.dumps({
+                'time': timestamp.isoformat(),
+                'remote': client,
+                'message': message,
+            })
+        return f"{client or '-'} - - [{timestamp.strftime('%d/%b/%Y:%H:%M:%S %z')}] {message}"
+
+    def _drop_notice(self):
+        """Return a line reporting entries dropped since the last notice, if any."""
+        with self._lock:
+            count = self.dropped - self._reported_dropped
+            self._reported_dropped = self.dropped
+        if not count:
+            return None
+        return self._format_message(
+            datetime.now().astimezone(), None,
+            f"access log queue full, dropped {count} entries"
+        )
+
+    def _run(self):
+        """Writer thread: drain the queue in batches and flush each batch once."""
+        stopping = False
+        while not stopping:
+            entries = [self._queue.get()]
+            while len(entries) < self.batch_size:
+                try:
+                    entries.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            lines = []
+            for entry in entries:
+                if entry is _STOP:
+                    stopping = True
+                    continue
+                lines.append(self._format(entry))
+
+            notice = self._drop_notice()
+            if notice:
+                lines.append(notice)
+
+            if lines:
+                self._write(lines)
+
+    def _write(self, lines):
+        """Write lines to the sink, checking for rollover before each line."""
+        sink = self._sink
+        rotating = isinstance(sink, logging.handlers.BaseRotatingHandler)
+        record = logging.makeLogRecord({})
+        sink.acquire()
+        try:
+            for line in lines:
+                record = logging.makeLogRecord({'msg': line})
+                if rotating and sink.shouldRollover(record):
+                    sink.doRollover()
+                sink.stream.write(line + sink.terminator)
+            sink.flush()
+        except Exception:
+            sink.handleError(record)
+        finally:
+            sink.release()
+
+    def close(self, timeout=5.0):
+        """Flush pending entries, stop the writer thread and close the log file."""
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            pass
+        self._thread.join(timeout)
+        # Closing the sink while the writer is still inside _write() would
+        # race with the write, so leave it to interpreter shutdown instead
+        if not self._thread.is_alive():
+            self._sink.close()
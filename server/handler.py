@@ -1,5 +1,6 @@
 import os
 import io
+import time
 import urllib.parse
 from http.server import SimpleHTTPRequestHandler
 import cgi
@@ -12,6 +13,10 @@ class UploadEnabledHTTPHandler(SimpleHTTPRequestHandler):
     # Define the data directory
     data_directory = "data"
     
+    # Asynchronous access logger (server.access_log.AccessLogger); when None
+    # the standard synchronous stderr logging is used
+    access_logger = None
+    
     # Define content type mappings
     extensions_map = {
         '.html': 'text/html',
@@ -32,6 +37,63 @@ class UploadEnabledHTTPHandler(SimpleHTTPRequestHandler):
         '': 'application/octet-stream',    # Default
     }
     
+    def _reset_access_state(self):
+        """Reset the per-request state recorded for the access log."""
+        self._access_start = time.monotonic()
+        self._access_status = None
+        self._access_size = 0
+    
+    def parse_request(self):
+        """Start timing the request once its request line has been read."""
+        self._reset_access_state()
+        return super().parse_request()
+    
+    def handle_one_request(self):
+        """Handle a single request and queue its access log entry."""
+        # parse_request resets this state again after the (possibly idle
+        # keep-alive) read of the request line; this reset only matters for
+        # errors sent before parse_request is reached, e.g. 414 URI Too Long
+        self._reset_access_state()
+        try:
+            super().handle_one_request()
+        finally:
+            if self.access_logger is not None and self._access_status is not None:
+                # command, path and request_version are only trustworthy once
+                # parse_request has accepted the request line; on a rejected
+                # line path may still belong to the previous keep-alive request
+                command = getattr(self, 'command', None)
+                self.access_logger.log_request(
+                    self.address_string(),
+                    getattr(self, 'requestline', ''),
+                    command,
+                    self.path if command else None,
+                    self.request_version if command else None,
+                    self._access_status,
+                    0 if command == 'HEAD' else self._access_size,
+                    time.monotonic() - self._access_start,
+                )
+    
+    def log_request(self, code='-', size='-'):
+        """Record the response status for the access log instead of writing it immediately."""
+        if self.access_logger is None:
+            return super().log_request(code, size)
+        self._access_status = int(code)
+    
+    def log_message(self, format, *args):
+        """Route handler messages (e.g. errors) through the access logger when enabled."""
+        if self.access_logger is None:
+            return super().log_message(format, *args)
+        self.access_logger.log_message(self.address_string(), format % args)
+    
+    def send_header(self, keyword, value):
+        """Track Content-Length so the access log can report response size."""
+        if keyword.lower() == 'content-length':
+            try:
+                self._access_size = int(value)
+            except ValueError:
+                pass
+        super().send_header(keyword, value)
+    
     def translate_path(self, path):
         """Override translate_path to restrict access to the data directory."""
         # Normalize the URL path
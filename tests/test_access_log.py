@@ -0,0 +1,190 @@
+import io
+import os
+import re
+import glob
+import json
+import time
+import logging
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from server.access_log import AccessLogger
+
+
+class BlockingSink(logging.StreamHandler):
+    """In-memory stream handler whose flush blocks until unblocked."""
+
+    def __init__(self):
+        super().__init__(io.StringIO())
+        self.unblocked = threading.Event()
+
+    def flush(self):
+        self.unblocked.wait(5)
+
+    @property
+    def lines(self):
+        return self.stream.getvalue().splitlines()
+
+
+def log_get(logger, path, status=200, size=1):
+    """Log a successful-looking GET request for path."""
+    logger.log_request('127.0.0.1', f'GET {path} HTTP/1.1', 'GET', path, 'HTTP/1.1',
+                       status, size, 0.001)
+
+
+class AccessLoggerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'access.log')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def read_lines(self, path=None):
+        with open(path or self.path, encoding='utf-8') as f:
+            return f.read().splitlines()
+
+    def test_full_queue_drops_and_reports(self):
+        sink = BlockingSink()
+        with mock.patch.object(AccessLogger, '_create_sink', return_value=sink):
+            logger = AccessLogger(queue_size=2, batch_size=1)
+        for _ in range(100):
+            log_get(logger, '/')
+        sink.unblocked.set()
+        logger.close()
+        lines = sink.lines
+
+        self.assertGreater(logger.dropped, 0)
+        reported = sum(
+            int(match.group(1))
+            for match in (re.search(r'dropped (\d+) entries', line) for line in lines)
+            if match
+        )
+        self.assertEqual(reported, logger.dropped)
+        requests = [line for line in lines if '"GET / HTTP/1.1"' in line]
+        self.assertEqual(len(requests) + logger.dropped, 100)
+
+    def test_json_fields(self):
+        logger = AccessLogger(path=self.path, log_format='json')
+        logger.log_request('127.0.0.1', 'GET /a.txt?x=1 HTTP/1.1', 'GET', '/a.txt?x=1', 'HTTP/1.1',
+                           200, 6, 0.0125)
+        logger.close()
+
+        entry = json.loads(self.read_lines()[0])
+        self.assertEqual(entry['remote'], '127.0.0.1')
+        self.assertEqual(entry['method'], 'GET')
+        self.assertEqual(entry['route'], '/a.txt')
+        self.assertEqual(entry['protocol'], 'HTTP/1.1')
+        self.assertEqual(entry['status'], 200)
+        self.assertEqual(entry['bytes'], 6)
+        self.assertEqual(entry['duration_ms'], 12.5)
+        self.assertIn('time', entry)
+
+    def test_json_fields_for_rejected_request_line(self):
+        logger = AccessLogger(path=self.path, log_format='json')
+        logger.log_request('127.0.0.1', '', '', '', '', 414, 0, 0.001)
+        logger.log_request('127.0.0.1', 'GET /x HTTP/9z', None, None, None, 400, 0, 0.001)
+        logger.close()
+
+        for line in self.read_lines():
+            entry = json.loads(line)
+            self.assertIsNone(entry['method'])
+            self.assertIsNone(entry['route'])
+            self.assertIsNone(entry['protocol'])
+
+    def test_common_log_format(self):
+        logger = AccessLogger(path=self.path)
+        log_get(logger, '/a.txt?x=1', size=6)
+        logger.log_request('127.0.0.1', 'HEAD /a.txt HTTP/1.1', 'HEAD', '/a.txt', 'HTTP/1.1',
+                           200, 0, 0.01)
+        logger.log_request('127.0.0.1', 'GET /x HTTP/9z', None, None, None, 400, 363, 0.01)
+        logger.log_request('127.0.0.1', '', '', '', '', 414, 0, 0.01)
+        logger.close()
+
+        lines = self.read_lines()
+        self.assertRegex(
+            lines[0],
+            r'^127\.0\.0\.1 - - \[\d{2}/\w{3}/\d{4}:\d{2}:\d{2}:\d{2} [+-]\d{4}\] '
+            r'"GET /a\.txt\?x=1 HTTP/1\.1" 200 6$'
+        )
+        self.assertTrue(lines[1].endswith('"HEAD /a.txt HTTP/1.1" 200 -'))
+        self.assertTrue(lines[2].endswith('"GET /x HTTP/9z" 400 363'))
+        self.assertTrue(lines[3].endswith('"-" 414 -'))
+
+    def test_errors_always_logged_when_sampled_out(self):
+        logger = AccessLogger(path=self.path, log_format='json', sample_rate=0.0)
+        log_get(logger, '/')
+        log_get(logger, '/missing', status=404)
+        logger.close()
+
+        statuses = [json.loads(line)['status'] for line in self.read_lines()]
+        self.assertEqual(statuses, [404])
+
+    def test_fractional_sample_rate(self):
+        logger = AccessLogger(path=self.path, log_format='json', sample_rate=0.25)
+        with mock.patch('server.access_log.random.random', side_effect=[0.1, 0.25, 0.9, 0.24]):
+            for i in range(4):
+                log_get(logger, f'/{i}')
+        logger.close()
+
+        routes = [json.loads(line)['route'] for line in self.read_lines()]
+        self.assertEqual(routes, ['/0', '/3'])
+
+    def test_size_rotation(self):
+        logger = AccessLogger(path=self.path, max_bytes=1000, backup_count=3)
+        for i in range(3000):
+            log_get(logger, f'/{i}')
+        logger.close()
+
+        for suffix in ('', '.1', '.2', '.3'):
+            self.assertLessEqual(os.path.getsize(self.path + suffix), 1000)
+        self.assertFalse(os.path.exists(self.path + '.4'))
+        self.assertTrue(self.read_lines()[-1].endswith('"GET /2999 HTTP/1.1" 200 1'))
+
+    def test_time_rotation(self):
+        # The handler truncates its start time to whole seconds, so a 2s
+        # interval guarantees the first entry is written before the rollover
+        logger = AccessLogger(path=self.path, rotate_interval=2, backup_count=2)
+        log_get(logger, '/0')
+        time.sleep(2.1)
+        log_get(logger, '/1')
+        logger.close()
+
+        rotated = glob.glob(self.path + '.*')
+        self.assertEqual(len(rotated), 1)
+        self.assertEqual(len(self.read_lines()), 1)
+        self.assertTrue(self.read_lines()[0].endswith('"GET /1 HTTP/1.1" 200 1'))
+        self.assertTrue(self.read_lines(rotated[0])[0].endswith('"GET /0 HTTP/1.1" 200 1'))
+
+    def test_close_flushes_pending_entries(self):
+        logger = AccessLogger(path=self.path, batch_size=7)
+        for i in range(500):
+            log_get(logger, f'/{i}')
+        logger.close()
+
+        self.assertFalse(logger._thread.is_alive())
+        self.assertEqual(len(self.read_lines()), 500)
+
+    def test_invalid_options(self):
+        invalid = [
+            {'queue_size': 0},
+            {'queue_size': -1},
+            {'sample_rate': 1.5},
+            {'log_format': 'combined'},
+            {'max_bytes': -1},
+            {'rotate_interval': -1},
+            {'max_bytes': 100, 'rotate_interval': 10},
+            {'max_bytes': 100, 'backup_count': 0},
+            {'rotate_interval': 10, 'backup_count': 0},
+        ]
+        for options in invalid:
+            with self.subTest(options=options):
+                with self.assertRaises(ValueError):
+                    AccessLogger(path=self.path, **options)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+import os
+import re
+import json
+import shutil
+import socket
+import tempfile
+import threading
+import unittest
+import http.client
+from http.server import ThreadingHTTPServer
+
+from server import UploadEnabledHTTPHandler, AccessLogger
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class HandlerAccessLogTest(unittest.TestCase):
+    """Run the handler in a real server and check what it logs."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        shutil.copytree(os.path.join(REPO_DIR, 'templates'),
+                        os.path.join(self.tmpdir.name, 'templates'))
+        os.makedirs(os.path.join(self.tmpdir.name, 'data'))
+        with open(os.path.join(self.tmpdir.name, 'data', 'a.txt'), 'wb') as f:
+            f.write(b'hello\n')
+        self.log_path = os.path.join(self.tmpdir.name, 'access.log')
+
+        # The handler resolves data/ and templates/ against the working directory
+        self.old_cwd = os.getcwd()
+        os.chdir(self.tmpdir.name)
+
+    def tearDown(self):
+        os.chdir(self.old_cwd)
+        self.tmpdir.cleanup()
+
+    def start_server(self, log_format):
+        """Start a server on a free port with a logger writing log_format."""
+        self.logger = AccessLogger(path=self.log_path, log_format=log_format)
+        handler = type('Handler', (UploadEnabledHTTPHandler,), {'access_logger': self.logger})
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+        # Let server_close() wait for handler threads so every entry is queued
+        self.server.daemon_threads = False
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        # Cleanups run in reverse order; all of them are safe to repeat
+        self.addCleanup(self.logger.close)
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+    def stop_server(self):
+        """Stop the server and return the lines written to the access log."""
+        self.server.shutdown()
+        self.server.server_close()
+        self.logger.close()
+        with open(self.log_path, encoding='utf-8') as f:
+            return f.read().splitlines()
+
+    def request(self, method, path, body=None, headers=None):
+        """Send a request and return the response status."""
+        conn = http.client.HTTPConnection('127.0.0.1', self.server.server_address[1])
+        try:
+            conn.request(method, path, body=body, headers=headers or {})
+            response = conn.getresponse()
+            response.read()
+            return response.status
+        finally:
+            conn.close()
+
+    def send_raw(self, data):
+        """Send raw bytes and read the response until the server closes."""
+        with socket.create_connection(self.server.server_address) as sock:
+            sock.sendall(data)
+            while sock.recv(4096):
+                pass
+
+    def test_json_entries(self):
+        self.start_server('json')
+        self.assertEqual(self.request('GET', '/a.txt?x=1'), 200)
+        self.assertEqual(self.request('HEAD', '/a.txt'), 200)
+        self.assertEqual(self.request('GET', '/missing.txt'), 404)
+        self.assertEqual(self.request('GET', '/'), 200)
+        self.assertEqual(self.request(
+            'POST', '/?action=create_folder', body='folder_name=new',
+            headers={'Content-Type': 'application/x-www-form-urlencoded'}
+        ), 303)
+        self.send_raw(b'GET /x HTTP/9z\r\n\r\n')
+        entries = [json.loads(line) for line in self.stop_server()]
+
+        # Entries are queued after the response is sent, so concurrent
+        # handler threads may log in any order
+        requests = {
+            (entry['method'], entry['route']): entry
+            for entry in entries if 'status' in entry
+        }
+        self.assertEqual(len(requests), 6)
+        expected = {
+            ('GET', '/a.txt'): (200, 6),
+            ('HEAD', '/a.txt'): (200, 0),
+            ('POST', '/'): (303, 0),
+        }
+        for key, (status, size) in expected.items():
+            self.assertEqual((requests[key]['status'], requests[key]['bytes']), (status, size))
+        self.assertEqual(requests[('GET', '/missing.txt')]['status'], 404)
+        self.assertGreater(requests[('GET', '/missing.txt')]['bytes'], 0)
+        self.assertEqual(requests[('GET', '/')]['status'], 200)
+        self.assertGreater(requests[('GET', '/')]['bytes'], 0)
+        self.assertEqual(requests[(None, None)]['status'], 400)
+        for entry in requests.values():
+            self.assertEqual(entry['remote'], '127.0.0.1')
+            self.assertEqual(entry['protocol'] is None, entry['method'] is None)
+            self.assertGreaterEqual(entry['duration_ms'], 0)
+
+        messages = sorted(entry['message'] for entry in entries if 'message' in entry)
+        self.assertEqual(messages, [
+            "code 400, message Bad request version ('HTTP/9z')",
+            'code 404, message File not found',
+        ])
+        self.assertTrue(os.path.isdir(os.path.join('data', 'new')))
+
+    def test_common_entries(self):
+        self.start_server('common')
+        self.assertEqual(self.request('GET', '/a.txt?x=1'), 200)
+        self.assertEqual(self.request('HEAD', '/a.txt'), 200)
+        self.send_raw(b'GET /x HTTP/9z\r\n\r\n')
+        lines = self.stop_server()
+
+        self.assertEqual(len(lines), 4)
+        self.assertTrue(any(line.endswith('"GET /a.txt?x=1 HTTP/1.1" 200 6') for line in lines))
+        self.assertTrue(any(line.endswith('"HEAD /a.txt HTTP/1.1" 200 -') for line in lines))
+        self.assertTrue(any(re.search(r'"GET /x HTTP/9z" 400 \d+$', line) for line in lines))
+        self.assertTrue(any("code 400, message Bad request version ('HTTP/9z')" in line
+                            for line in lines))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import io
+import argparse
+import unittest
+from contextlib import redirect_stderr
+
+from main import positive_int, non_negative_int, sample_rate, parse_arguments
+
+
+class ArgumentTypeTest(unittest.TestCase):
+
+    def test_positive_int(self):
+        self.assertEqual(positive_int('1'), 1)
+        self.assertEqual(positive_int('42'), 42)
+        for value in ('0', '-1'):
+            with self.subTest(value=value):
+                with self.assertRaises(argparse.ArgumentTypeError):
+                    positive_int(value)
+        with self.assertRaises(ValueError):
+            positive_int('abc')
+
+    def test_non_negative_int(self):
+        self.assertEqual(non_negative_int('0'), 0)
+        self.assertEqual(non_negative_int('10'), 10)
+        with self.assertRaises(argparse.ArgumentTypeError):
+            non_negative_int('-1')
+        with self.assertRaises(ValueError):
+            non_negative_int('1.5')
+
+    def test_sample_rate(self):
+        self.assertEqual(sample_rate('0'), 0.0)
+        self.assertEqual(sample_rate('0.25'), 0.25)
+        self.assertEqual(sample_rate('1'), 1.0)
+        for value in ('-0.1', '1.5'):
+            with self.subTest(value=value):
+                with self.assertRaises(argparse.ArgumentTypeError):
+                    sample_rate(value)
+
+
+class ParseArgumentsTest(unittest.TestCase):
+
+    def assert_rejected(self, argv):
+        with redirect_stderr(io.StringIO()), self.assertRaises(SystemExit) as cm:
+            parse_arguments(argv)
+        self.assertEqual(cm.exception.code, 2)
+
+    def test_defaults(self):
+        args = parse_arguments([])
+        self.assertEqual(args.access_log, '-')
+        self.assertEqual(args.access_log_format, 'common')
+        self.assertEqual(args.access_log_backups, 5)
+        self.assertEqual(args.access_log_queue_size, 10000)
+
+    def test_rotation_options_with_file(self):
+        args = parse_arguments(['--access-log', 'access.log', '--access-log-max-bytes', '100',
+                                '--access-log-backups', '2'])
+        self.assertEqual(args.access_log_max_bytes, 100)
+        self.assertEqual(args.access_log_backups, 2)
+
+    def test_invalid_arguments(self):
+        invalid = [
+            ['--access-log-queue-size', '0'],
+            ['--access-log-sample', '2'],
+            ['--access-log', 'access.log', '--access-log-max-bytes', '-1'],
+            ['--access-log', 'access.log', '--access-log-max-bytes', '100',
+             '--access-log-rotate-interval', '60'],
+            ['--access-log', 'access.log', '--access-log-backups', '0'],
+            ['--access-log-max-bytes', '100'],
+            ['--access-log-rotate-interval', '60'],
+            ['--access-log-backups', '3'],
+        ]
+        for argv in invalid:
+            with self.subTest(argv=argv):
+                self.assert_rejected(argv)
+
+
+if __name__ == '__main__':
+    unittest.main()